@@ -0,0 +1,85 @@
+import threading
+import time
+from collections import OrderedDict
+
+# Iraqi mobile numbers are 10 digits after the leading 0 (770 123 4567).
+NATIONAL_MOBILE_DIGITS = 10
+COUNTRY_CODE = "964"
+
+def normalize_mobile(value: str) -> str:
+    """Reduce 0770..., +964770... and 00964770... to the same key."""
+    raw = value.strip()
+    digits = ''.join(ch for ch in raw if ch.isdigit())
+    international = raw.startswith("+")
+    if digits.startswith("00"):
+        digits = digits[2:]
+        international = True
+    if digits.startswith(COUNTRY_CODE) and (
+        international or len(digits) == len(COUNTRY_CODE) + NATIONAL_MOBILE_DIGITS
+    ):
+        digits = digits[len(COUNTRY_CODE):]
+    return digits.lstrip("0")
+
+class TokenBuckets:
+    """Thread-safe token buckets stored as {key: (tokens, last_seen)}.
+
+    Entries are kept in last_seen order, so expiry pops from the front and a
+    full table evicts its stalest bucket in O(1). A bucket idle long enough to
+    refill completely is indistinguishable from a new one.
+    """
+
+    def __init__(self, burst: int, refill_seconds: float, max_keys: int, clock=time.monotonic):
+        self.burst = burst
+        self.refill_seconds = refill_seconds
+        self.max_keys = max_keys
+        self._clock = clock
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_sweep = 0.0
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def _sweep(self, now: float):
+        idle = self.burst * self.refill_seconds
+        while self._buckets:
+            key, (_, seen) = next(iter(self._buckets.items()))
+            if now - seen < idle:
+                break
+            del self._buckets[key]
+        self._next_sweep = now + self.refill_seconds
+
+    def _level(self, key: str, now: float) -> float:
+        tokens, seen = self._buckets.get(key, (self.burst, now))
+        return min(self.burst, tokens + (now - seen) / self.refill_seconds)
+
+    def _store(self, key: str, tokens: float, now: float):
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+
+    def take(self, *keys: str) -> bool:
+        """Spend one token from every bucket in keys, or from none of them."""
+        now = self._clock()
+        with self._lock:
+            if now >= self._next_sweep:
+                self._sweep(now)
+            levels = [self._level(k, now) for k in keys]
+            if any(level < 1 for level in levels):
+                return False
+            for k in keys:
+                if k in self._buckets:
+                    self._buckets.move_to_end(k)
+            new_keys = sum(1 for k in keys if k not in self._buckets)
+            while self._buckets and len(self._buckets) + new_keys > self.max_keys:
+                self._buckets.popitem(last=False)
+            for k, level in zip(keys, levels):
+                self._store(k, level - 1, now)
+            return True
+
+    def refund(self, *keys: str):
+        """Give back the token spent by take() for a request that was not served."""
+        now = self._clock()
+        with self._lock:
+            for k in keys:
+                if k in self._buckets:
+                    self._store(k, min(self.burst, self._level(k, now) + 1), now)
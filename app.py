@@ -1,6 +1,8 @@
 import os
 import io
 import sqlite3
+import threading
+import uuid
 from datetime import datetime
 
 import pandas as pd
@@ -8,6 +10,8 @@ import streamlit as st
 import pydeck as pdk
 from fpdf import FPDF
 
+from admission import TokenBuckets, normalize_mobile
+
 APP_TITLE = "People Connect – Citizen Submissions"
 FOOTER_CREDIT = "Prepared by Shvan Qaraman"
 
@@ -35,6 +39,13 @@ DEPT_PASSWORDS = st.secrets.get("DEPT_PASSWORDS", {})  # {"Municipal": "pass"}
 # Restrict the whole app (including public tabs) if desired
 RESTRICT_ALL = bool(st.secrets.get("RESTRICT_ALL", False))
 
+# Admission control on the submit path: each mobile number and each browser session
+# gets RATE_BURST submissions, refilled at one every RATE_REFILL_SECONDS.
+RATE_BURST = int(st.secrets.get("RATE_BURST", 3))
+RATE_REFILL_SECONDS = float(st.secrets.get("RATE_REFILL_SECONDS", 600))
+RATE_MAX_KEYS = int(st.secrets.get("RATE_MAX_KEYS", 100_000))
+MAX_CONCURRENT_UPLOADS = int(st.secrets.get("MAX_CONCURRENT_UPLOADS", 4))
+
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 # ---------------------- I18N ----------------------
@@ -59,6 +70,8 @@ LANGS = {
         "btn_submit": "Submit",
         "fill_all": "Please fill all required fields.",
         "bad_mobile": "Mobile number looks invalid. Please check.",
+        "rate_limited": "Too many submissions. Please try again later.",
+        "busy": "The server is busy. Please try again in a moment.",
         "success": "Submitted successfully!",
         "public_list": "All Submissions (Public View)",
         "filter_type": "Filter Type",
@@ -117,6 +130,8 @@ LANGS = {
         "btn_submit": "أرسل",
         "fill_all": "يرجى ملء جميع الحقول المطلوبة.",
         "bad_mobile": "رقم الهاتف غير صالح.",
+        "rate_limited": "عدد كبير من الطلبات. يرجى المحاولة لاحقاً.",
+        "busy": "الخادم مشغول. يرجى المحاولة بعد قليل.",
         "success": "تم الإرسال بنجاح!",
         "public_list": "جميع الطلبات (عرض عام)",
         "filter_type": "تصفية النوع",
@@ -175,6 +190,8 @@ LANGS = {
         "btn_submit": "بنێرە",
         "fill_all": "تکایە هەموو خانە پێویستان پڕ بکەوە.",
         "bad_mobile": "ژمارەی مۆبایل دروست نییە.",
+        "rate_limited": "ناردنی زۆر. تکایە دواتر هەوڵ بدەرەوە.",
+        "busy": "سێرڤەر سەرقاڵە. تکایە کەمێکی تر هەوڵ بدەرەوە.",
         "success": "ناردن سەرکەوتوو بوو!",
         "public_list": "هەموو ناردنەکان (بینینی گشتی)",
         "filter_type": "پاڵاوتنی جۆر",
@@ -293,6 +310,23 @@ def delete_row(row_id: int):
     con.commit()
     con.close()
 
+# ---------------------- ADMISSION CONTROL ----------------------
+@st.cache_resource
+def get_submit_buckets():
+    return TokenBuckets(RATE_BURST, RATE_REFILL_SECONDS, RATE_MAX_KEYS)
+
+@st.cache_resource
+def get_upload_slots():
+    return threading.BoundedSemaphore(MAX_CONCURRENT_UPLOADS)
+
+def session_key() -> str:
+    if "_sid" not in st.session_state:
+        st.session_state["_sid"] = uuid.uuid4().hex
+    return "sid:" + st.session_state["_sid"]
+
+def submission_keys(mobile: str) -> tuple:
+    return ("mob:" + normalize_mobile(mobile), session_key())
+
 # ---------------------- UTIL ----------------------
 def footer_branding():
     st.markdown(
@@ -431,20 +465,40 @@ def page_submit(departments: list[str]):
             if not mobile_is_valid(mobile):
                 st.error(t("bad_mobile"))
                 return
-            file_paths = save_attachments(files[:3] if files else [])
-            insert_submission(
-                {
-                    "type": entry_type,
-                    "department": dept,
-                    "name": name.strip(),
-                    "mobile": mobile.strip(),
-                    "address": address.strip(),
-                    "message": message.strip(),
-                    "lat": float(lat) if lat is not None else None,
-                    "lon": float(lon) if lon is not None else None,
-                    "attachments": file_paths,
-                }
-            )
+            files = files[:3] if files else []
+            slots = get_upload_slots()
+            if files and not slots.acquire(blocking=False):
+                st.error(t("busy"))
+                return
+            buckets = get_submit_buckets()
+            keys = submission_keys(mobile)
+            if not buckets.take(*keys):
+                if files:
+                    slots.release()
+                st.error(t("rate_limited"))
+                return
+            try:
+                try:
+                    file_paths = save_attachments(files)
+                finally:
+                    if files:
+                        slots.release()
+                insert_submission(
+                    {
+                        "type": entry_type,
+                        "department": dept,
+                        "name": name.strip(),
+                        "mobile": mobile.strip(),
+                        "address": address.strip(),
+                        "message": message.strip(),
+                        "lat": float(lat) if lat is not None else None,
+                        "lon": float(lon) if lon is not None else None,
+                        "attachments": file_paths,
+                    }
+                )
+            except Exception:
+                buckets.refund(*keys)
+                raise
             st.success("✅ " + t("success"))
             load_df.clear()
 
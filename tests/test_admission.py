@@ -0,0 +1,87 @@
+from admission import TokenBuckets, normalize_mobile
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def make_buckets(burst=3, refill=10.0, max_keys=100):
+    clock = FakeClock()
+    return TokenBuckets(burst, refill, max_keys, clock=clock), clock
+
+def test_burst_then_reject():
+    b, _ = make_buckets()
+    assert [b.take("mob:1", "sid:1") for _ in range(4)] == [True, True, True, False]
+
+def test_refill_over_time():
+    b, clock = make_buckets()
+    for _ in range(3):
+        b.take("mob:1")
+    assert not b.take("mob:1")
+    clock.now = 9.9
+    assert not b.take("mob:1")
+    clock.now = 10.0
+    assert b.take("mob:1")
+
+def test_spends_both_or_neither():
+    b, _ = make_buckets()
+    for _ in range(3):
+        b.take("mob:1", "sid:1")
+    assert not b.take("mob:1", "sid:2")
+    assert not b.take("mob:2", "sid:1")
+    # The rejected calls must not have debited the fresh buckets.
+    assert [b.take("mob:2", "sid:2") for _ in range(4)] == [True, True, True, False]
+
+def test_refund_returns_token():
+    b, _ = make_buckets()
+    for _ in range(3):
+        b.take("mob:1", "sid:1")
+    b.refund("mob:1", "sid:1")
+    assert b.take("mob:1", "sid:1")
+    assert not b.take("mob:1", "sid:1")
+
+def test_sweep_expires_idle_buckets():
+    b, clock = make_buckets()
+    b.take("mob:1")
+    clock.now = 5.0
+    b.take("mob:2")
+    clock.now = 31.0
+    b.take("mob:3")
+    assert len(b) == 2
+    clock.now = 41.0
+    b.take("mob:3")
+    assert len(b) == 1
+
+def test_full_table_keeps_existing_buckets():
+    b, clock = make_buckets(max_keys=10)
+    for i in range(5):
+        clock.now = float(i)
+        assert b.take(f"mob:{i}", f"sid:{i}")
+    assert len(b) == 10
+    assert b.take("mob:0", "sid:0")
+    assert len(b) == 10
+
+def test_full_table_evicts_stalest():
+    b, clock = make_buckets(max_keys=4)
+    clock.now = 0.0
+    b.take("mob:old", "sid:old")
+    clock.now = 1.0
+    b.take("mob:mid", "sid:mid")
+    clock.now = 2.0
+    assert b.take("mob:new", "sid:new")
+    assert len(b) == 4
+    assert "mob:old" not in b._buckets
+    assert "mob:mid" in b._buckets
+
+def test_normalize_same_number_formats():
+    keys = {
+        normalize_mobile(v)
+        for v in ["07701234567", "+964 770 123 4567", "009647701234567", "9647701234567"]
+    }
+    assert keys == {"7701234567"}
+
+def test_normalize_keeps_local_964_prefix():
+    assert normalize_mobile("9640770123") == "9640770123"
+    assert normalize_mobile("9640770123") != normalize_mobile("0770123")